@@ -25,6 +25,7 @@ setup(
     install_requires=[
         'anytree==2.*,>=2.8.0',
         'gherkin-official==20.*,>=20.0.1',
+        'orjson==3.*,>=3.6.0',
         'tabulate==0.*,>=0.8.9',
         'qaseio @ git+https://github.com/paramono/qase-python.git@master#egg=qaseio&subdirectory=qaseio',
     ],
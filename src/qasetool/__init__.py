@@ -1,18 +1,18 @@
 __version__ = '0.9.1'
 
 import argparse
-import json
 import logging
 import os
 import sys
 
+import orjson
+
 from attr import attrs, attrib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from glob import iglob
 from pathlib import Path
 
-from qaseio.client import QaseApi
-from qaseio.client.models import TestCaseCreate, TestSuiteCreate, TestCaseFilters
-
 from . import config
 from .api import get_all_suites, get_all_cases
 from .gherkin import gherkin_as_nodes
@@ -33,29 +33,38 @@ logger = logging.getLogger(__name__)
 
 
 def find_feature_files(target_dir):
-    target_dir = Path(target_dir).expanduser()
-    for filepath in target_dir.rglob("*.feature"):
-        rel_filepath = filepath.relative_to(target_dir)
-        yield rel_filepath, filepath
+    # os.walk (scandir-based) is noticeably cheaper than Path.rglob
+    # on big directory trees; paths stay plain strings all the way down
+    target_dir = os.path.expanduser(target_dir)
+    for dirpath, _, filenames in os.walk(target_dir):
+        for filename in filenames:
+            if filename.endswith('.feature'):
+                abs_filepath = os.path.join(dirpath, filename)
+                rel_filepath = os.path.relpath(abs_filepath, target_dir)
+                yield rel_filepath, abs_filepath
 
 
 def parse_custom_fields_file(path):
     path = Path(path).expanduser()
-    return json.load(open(path, 'r'))
+    return orjson.loads(path.read_bytes())
 
 
 def build_local_case_tree_branch(tree, rel_filepath, abs_filepath):
-    dirs = [d for d in reversed(list(rel_filepath.parents)) if d != Path(".")]
-
-    for prev, current in zip([None] + dirs, dirs + [rel_filepath]):
-        node = tree.get_node_by_key(str(current))
+    # building ancestors root-to-leaf from parts avoids materializing and
+    # reversing the full parents list per file
+    parts = rel_filepath.split('/')
+    dirs = ['/'.join(parts[:i]) for i in range(1, len(parts))]
+
+    # carrying the parent across iterations saves a key lookup per level
+    parent = tree.root
+    for current in dirs + [rel_filepath]:
+        node = tree.get_node_by_key(current)
         if not node:
-            parent = tree.get_node_by_key(str(prev)) or tree.root
             node = tree.add_local_suite(parent, current)
 
             if current == rel_filepath:
-                for case in gherkin_as_nodes(abs_filepath, node):
-                    tree.add_node(case)
+                tree.add_many(gherkin_as_nodes(abs_filepath, node))
+        parent = node
     return tree
 
 
@@ -70,71 +79,90 @@ def build_local_case_tree(target_dir):
 
 
 def build_remote_case_tree(root_suite_id=None):
+    # deferred so that offline commands don't pay the qaseio import cost
+    from qaseio.client.models import TestCaseFilters, TestSuiteFilters
+
     if root_suite_id:
-        root_node = None
-        tree = None
+        root_suite = config.qase.suites.get(config.QASE_PROJECT_CODE, root_suite_id)
+        root_node = RemoteCaseNode(
+            root_suite.id,
+            entity=Entity.SUITE,
+            name=root_suite.title,
+            parent_id=None,
+            parent=None,
+        )
+        tree = Tree(root_node)
+
+        # fetching only the target subtree: BFS on parent_id, one level at
+        # a time, with the requests of each level issued concurrently
+        frontier = [root_suite_id]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            while frontier:
+                results = executor.map(
+                    lambda suite_id: get_all_suites(filters=TestSuiteFilters(parent_id=suite_id)),
+                    frontier,
+                )
+                frontier = []
+                for suites in results:
+                    for suite in suites:
+                        tree.add_remote_suite(suite)
+                        frontier.append(suite.id)
     else:
         root_node = RemoteCaseNode(None, entity=Entity.REPOSITORY, name="Repository")
         tree = Tree(root_node)
 
-    suites = get_all_suites()
-    for suite in suites:
-        if root_suite_id:
-            # omitting top-level suites that aren't our target
-            if suite.parent_id is None and suite.id != root_suite_id:
-                continue
-
-            # omitting leaf suites whose parent is not present in our id_map,
-            # i.e. from a branch we don't need
-            if suite.parent_id is not None:
-                if tree and not tree.get_node_by_suite_id(suite.parent_id):
-                    continue
-                if not tree:
-                    continue
-
-        if suite.id == root_suite_id and not root_node and not tree:
-            root_node = RemoteCaseNode(
-                suite.id,
-                entity=Entity.SUITE,
-                name=suite.title,
-                parent_id=None,
-                parent=None,
-            )
-            tree = Tree(root_node)
-        else:
+        for suite in get_all_suites():
             tree.add_remote_suite(suite)
 
-        cases = get_all_cases(filters=TestCaseFilters(suite_id=suite.id))
-        for case in cases:
-            tree.add_remote_case(case)
+    # case fetches are independent per suite, so overlap the round trips;
+    # the tree itself is only mutated from this thread
+    suite_ids = [suite_id for suite_id in tree.id_map if suite_id is not None]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = executor.map(
+            lambda suite_id: get_all_cases(filters=TestCaseFilters(suite_id=suite_id)),
+            suite_ids,
+        )
+        for cases in results:
+            for case in cases:
+                tree.add_remote_case(case)
 
     # if root_suite_id:
     #     return tree.get_node_by_suite_id(root_suite_id)
     return tree
 
 
+def build_trees(path, root_suite_id):
+    '''Builds the local and remote trees concurrently.
+
+    The local build is CPU/disk-bound while the remote build waits on the
+    network, so the two overlap almost perfectly
+    '''
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_local = executor.submit(build_local_case_tree, path)
+        future_remote = executor.submit(build_remote_case_tree, root_suite_id)
+        return future_local.result(), future_remote.result()
+
+
 def push(args):
-    tree_local = build_local_case_tree(args.path)
-    tree_remote = build_remote_case_tree(args.root_suite_id)
+    tree_local, tree_remote = build_trees(args.path, args.root_suite_id)
 
     tree_merged = diff_trees(tree_local, tree_remote)
     tree_merged.push(
         root_suite_id=args.root_suite_id,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        parallel=args.parallel,
     )
 
 
 def render_flat_diff(args):
-    tree_local = build_local_case_tree(args.path)
-    tree_remote = build_remote_case_tree(args.root_suite_id)
+    tree_local, tree_remote = build_trees(args.path, args.root_suite_id)
 
     operations = flat_diff_trees(tree_local, tree_remote)
     render_operations(operations, args.attr)
 
 
 def render_diff(args):
-    tree_local = build_local_case_tree(args.path)
-    tree_remote = build_remote_case_tree(args.root_suite_id)
+    tree_local, tree_remote = build_trees(args.path, args.root_suite_id)
 
     tree_merged = diff_trees(tree_local, tree_remote)
     tree_merged.render(attrname=args.attr, show_actions=True)
@@ -169,7 +197,13 @@ def file_path(path):
         raise argparse.ArgumentTypeError(f"{path} is not a valid file")
 
 
-def main():
+@lru_cache(maxsize=None)
+def build_parser():
+    '''Builds the CLI parser once per process.
+
+    argparse construction is surprisingly slow, so in-process callers
+    (test harnesses, repeated main() calls) shouldn't pay for it twice
+    '''
     parser = argparse.ArgumentParser(description='Parse .feature files and push to Qase')
 
     parser.add_argument(
@@ -243,6 +277,12 @@ def main():
         help='Whether updates should be pushed to Qase or simply printed'
     )
 
+    parser_parallel = argparse.ArgumentParser(add_help=False)
+    parser_parallel.add_argument(
+        '-p', '--parallel', metavar='<N>', type=int, default=8,
+        help='Number of concurrent requests while pushing to Qase'
+    )
+
     parser_push = subparsers.add_parser(
         'push',
         parents=[parser_path,
@@ -251,6 +291,7 @@ def main():
                  parser_project_code,
                  parser_custom_fields_path,
                  parser_dry_run,
+                 parser_parallel,
                  parser_strip_titles,
                  parser_exit_on_empty_files]
     )
@@ -297,6 +338,12 @@ def main():
     )
     parser_delete_remote.set_defaults(func=delete_remote_tree)
 
+    return parser
+
+
+def main():
+    parser = build_parser()
+
     if len(sys.argv) == 1:
         parser.print_help(sys.stderr)
         sys.exit(1)
@@ -304,7 +351,19 @@ def main():
     args = parser.parse_args()
 
     config.QASE_API_TOKEN = getattr(args, 'token', config.QASE_API_TOKEN)
-    config.qase = QaseApi(config.QASE_API_TOKEN)
+    if config.QASE_API_TOKEN:
+        # imported lazily: offline commands like render-local never need it
+        from qaseio.client import QaseApi
+        from requests.adapters import HTTPAdapter, Retry
+
+        config.qase = QaseApi(config.QASE_API_TOKEN)
+
+        # keep-alive pool sized to match our thread pools, so concurrent
+        # fetches reuse TCP/TLS connections instead of re-handshaking
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                              max_retries=Retry(total=3, backoff_factor=0.5))
+        config.qase._s.mount('https://', adapter)
+        config.qase._s.mount('http://', adapter)
 
     config.QASE_PROJECT_CODE = getattr(args, 'project_code', config.QASE_ROOT_SUITE_ID)
     config.QASE_ROOT_SUITE_ID = getattr(args, 'root_suite_id', config.QASE_ROOT_SUITE_ID)
@@ -1,28 +1,43 @@
-from qaseio.client import QaseApi
+from concurrent.futures import ThreadPoolExecutor
+
 from . import config
 
 
-def get_all_suites(limit=10, filters=None):
-    offset = 0
-    entities = []
-    while True:
-        response = config.qase.suites.get_all(config.QASE_PROJECT_CODE, offset=offset, limit=limit, filters=filters)
-        if response.count == 0:
-            break
+MAX_WORKERS = 8
 
-        offset += limit
-        entities.extend(response.entities)
-    return entities
 
+def get_all(endpoint, limit=100, filters=None):
+    """Fetches every entity from a paginated endpoint.
+
+    The first page tells us the total count, so all remaining pages can be
+    requested concurrently instead of waiting a full round trip per page.
+    """
+    response = endpoint.get_all(config.QASE_PROJECT_CODE, offset=0, limit=limit, filters=filters)
+    entities = list(response.entities)
+
+    # a short (or empty) first page already proves there is nothing beyond it
+    if response.count == 0 or len(entities) < limit:
+        return entities
 
-def get_all_cases(limit=10, filters=None):
-    offset = 0
-    entities = []
-    while True:
-        response = config.qase.cases.get_all(config.QASE_PROJECT_CODE, offset=offset, limit=limit, filters=filters)
-        if response.count == 0:
-            break
+    total = response.filtered if response.filtered is not None else response.total
+    if total is None or total <= limit:
+        return entities
 
-        offset += limit
-        entities.extend(response.entities)
+    offsets = range(limit, total, limit)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        responses = executor.map(
+            lambda offset: endpoint.get_all(
+                config.QASE_PROJECT_CODE, offset=offset, limit=limit, filters=filters),
+            offsets,
+        )
+        for response in responses:
+            entities.extend(response.entities)
     return entities
+
+
+def get_all_suites(limit=100, filters=None):
+    return get_all(config.qase.suites, limit=limit, filters=filters)
+
+
+def get_all_cases(limit=100, filters=None):
+    return get_all(config.qase.cases, limit=limit, filters=filters)
@@ -1,5 +1,7 @@
 import logging
 
+from functools import lru_cache
+
 from gherkin.parser import Parser
 from tabulate import tabulate
 
@@ -9,10 +11,13 @@ from .tree import Entity, LocalCaseNode
 
 logger = logging.getLogger(__name__)
 
+# constructing a Parser is expensive (token matcher setup), so reuse
+# a single instance across all .feature files
+_PARSER = Parser()
+
 
 def parse_gherkin_document(path):
-    parser = Parser()
-    return parser.parse(str(path))
+    return _PARSER.parse(str(path))
 
 
 def iterate_scenarios(path, document):
@@ -26,10 +31,10 @@ def iterate_scenarios(path, document):
             raise ValueError(f'Couldn\'t parse file {str(path)}')
 
     background = None
-    for child in feature.get('children', []):
-        if 'background' in child.keys():
+    for child in feature.get('children', ()):
+        if 'background' in child:
             background = child['background']
-        if 'scenario' in child.keys():
+        elif 'scenario' in child:
             yield child['scenario'], background
 
 
@@ -39,9 +44,10 @@ def gherkin_as_nodes(path, parent):
         yield gherkin_scenario_as_node(scenario, background, path, parent)
 
 
-def iterate_table_cells(source):
-    for cell in source.get('cells', []):
-        yield cell.get('value', '')
+@lru_cache(maxsize=256)
+def _render_table(header_row, body_rows):
+    # identical example tables (shared headers across outlines) render once
+    return tabulate(body_rows, header_row, tablefmt='github')
 
 
 def gherkin_parse_scenario_fields(scenario):
@@ -50,30 +56,31 @@ def gherkin_parse_scenario_fields(scenario):
     steps = scenario.get('steps')
     examples = scenario.get('examples', [])
 
-    description = f'**{keyword}**'
+    # collecting parts and joining once keeps assembly linear in step count
+    parts = [f'**{keyword}**']
     if gh_description:
-        description = f'{description}\n\n{gh_description}'
+        parts.append('')
+        parts.append(gh_description)
 
     if steps:
-        description = f'{description}\n'
+        parts.append('')
         for step in steps:
             keyword = step["keyword"].strip()  # parser returns leading space
-            description = f'{description}\n**{keyword}** {step["text"]}'
+            parts.append(f'**{keyword}** {step["text"]}')
 
     for example in examples:
         header_dict = example.get('tableHeader')
-        header_row = [x for x in iterate_table_cells(header_dict)]
+        header_row = tuple(cell.get('value', '') for cell in header_dict.get('cells', []))
 
-        body_list = example.get('tableBody')
-        body_rows = []
-        for body_dict in body_list:
-            body_row = [x for x in iterate_table_cells(body_dict)]
-            body_rows.append(body_row)
+        body_rows = tuple(
+            tuple(cell.get('value', '') for cell in body_dict.get('cells', []))
+            for body_dict in example.get('tableBody')
+        )
 
-        table = tabulate(body_rows, header_row, tablefmt='github')
-        description = f'{description}\n\n{table}'
+        parts.append('')
+        parts.append(_render_table(header_row, body_rows))
 
-    return dict(description=description)
+    return dict(description='\n'.join(parts))
 
 
 def gherkin_parse_background_fields(background):
@@ -1,26 +1,55 @@
-from typing import Tuple
+import re
+
+from functools import lru_cache
+from typing import Optional, Tuple
 
 
 def is_balanced(string: str, symbol: str) -> bool:
     return string.count(symbol) % 2 == 0
 
 
-def _get_var_boundary_positions(string: str, symbol: str) -> Tuple[int, int]:
-    var_start = string.find(f'{symbol}<')
-    var_end = string.rfind(f'>{symbol}')
-    if var_end != -1:
-        # compensating for search pattern length: instead of position of '>'
-        # we want to get position of {symbol}
-        var_end += 1
-    return var_start, var_end
-
+def _scan(string: str, symbol: str) -> Tuple[int, int, int, int, int, int, int]:
+    """Collects every fact about symbol occurrences in a single pass.
 
-def _handle_variables(string: str, symbol: str, balanced: bool = True) -> str:
+    Returns (count, first, last, inner_first, inner_last, var_start, var_end):
+    - count: total occurrences
+    - first/last: positions of the first and last occurrence
+    - inner_first: first occurrence past position 0
+    - inner_last: last occurrence before the final position
+    - var_start: first occurrence directly followed by '<'
+    - var_end: last occurrence directly preceded by '>'
+    All positions default to -1, mirroring find/rfind
+    """
+    end = len(string) - 1
+    count = 0
+    first = last = inner_first = inner_last = var_start = var_end = -1
+
+    pos = string.find(symbol)
+    while pos != -1:
+        count += 1
+        if first == -1:
+            first = pos
+        last = pos
+        if inner_first == -1 and pos >= 1:
+            inner_first = pos
+        if pos < end:
+            inner_last = pos
+        if var_start == -1 and string[pos+1:pos+2] == '<':
+            var_start = pos
+        if pos > 0 and string[pos-1] == '>':
+            var_end = pos
+        pos = string.find(symbol, pos + 1)
+
+    return count, first, last, inner_first, inner_last, var_start, var_end
+
+
+def _handle_variables(string: str, symbol: str, balanced: bool = True,
+                      scan: Optional[Tuple[int, ...]] = None) -> str:
     start = 0
     end = len(string) - 1
-    symbol_start = string.find(symbol)
-    symbol_end = string.rfind(symbol)
-    var_start, var_end = _get_var_boundary_positions(string, symbol)
+    if scan is None:
+        scan = _scan(string, symbol)
+    _, symbol_start, symbol_end, _, _, var_start, var_end = scan
 
     if var_start == symbol_start and var_end == symbol_end:
         return string
@@ -35,6 +64,19 @@ def _handle_variables(string: str, symbol: str, balanced: bool = True) -> str:
     return string
 
 
+@lru_cache(maxsize=8)
+def _plain_quoted_pattern(symbol: str) -> 're.Pattern':
+    '''Compiled matcher for the most common quoted-title shape.
+
+    A title wrapped in exactly one pair of the symbol, with no inner
+    occurrences and no '<variable>' touching either quote, strips to the
+    inner group without any of the heuristics below
+    '''
+    quote = re.escape(symbol)
+    return re.compile(rf'{quote}(?!<)([^{quote}]*)(?<!>){quote}')
+
+
+@lru_cache(maxsize=4096)
 def _strip_title(string: str, symbol: str) -> str:
     start = 0
     end = len(string) - 1
@@ -42,30 +84,40 @@ def _strip_title(string: str, symbol: str) -> str:
     if not (string[start] == symbol or string[end] == symbol):
         return string
 
-    balanced = is_balanced(string, symbol)
-    string = _handle_variables(string, symbol, balanced)
-
-    # variable handling might have fixed balance, hence recalculating
+    # one compiled-regex match covers the plain "'title'" case, skipping
+    # the occurrence scan entirely
+    match = _plain_quoted_pattern(symbol).fullmatch(string)
+    if match:
+        return match.group(1).strip(' ')
+
+    scan = _scan(string, symbol)
+    balanced = scan[0] % 2 == 0
+    stripped = _handle_variables(string, symbol, balanced, scan)
+    if stripped is not string:
+        # variable handling changed the string, so the scan is stale
+        string = stripped
+        scan = _scan(string, symbol)
+
+    count, _, _, inner_first, inner_last, var_start, var_end = scan
     end = len(string) - 1
-    balanced = is_balanced(string, symbol)
-    if not balanced and string.count(symbol) == 1:
+    balanced = count % 2 == 0
+    if not balanced and count == 1:
         # trailing symbol at the end or at the beginning
         if string[start] == symbol:
             string = string[start+1:]
         elif string[end] == symbol:
             string = string[:end]
-    elif not balanced and string.count(symbol) == 3:
+    elif not balanced and count == 3:
         # preserving quotes with the shortest distance and omitting the farthest one
-        left_distance = string.find(symbol, start+1) - start
-        right_distance = end - string.rfind(symbol, start, end)
+        left_distance = inner_first - start
+        right_distance = end - inner_last
         if left_distance > right_distance:
             string = string[start+1:]
         else:
             string = string[:end]
-    elif not balanced and string.count(symbol) > 3:
+    elif not balanced and count > 3:
         # we might have apostrophes and all sorts of other quotes we won't be able to handle
         # without NLP, hence trying to strip naively:
-        var_start, var_end = _get_var_boundary_positions(string, symbol)
         if var_start != start and var_end != end and string[start] == string[end] == symbol:
             string = string[start+1:end]
     return string.strip(' ')
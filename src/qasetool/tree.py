@@ -1,18 +1,12 @@
 import logging
 
-from copy import deepcopy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, unique
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
-from anytree import NodeMixin, PreOrderIter, RenderTree, LevelOrderGroupIter
-
-from qaseio.client.models import (
-    TestSuiteCreate,
-    TestSuiteUpdate,
-    TestCaseCreate,
-    TestCaseUpdate,
-)
-from qaseio.client.services import BadRequestException
+from anytree import NodeMixin
 
 from . import config
 from .api import get_all_suites, get_all_cases
@@ -22,6 +16,40 @@ from .string import strip_title
 logger = logging.getLogger(__name__)
 
 
+# filepaths are stored as plain POSIX strings: the tree code only ever
+# needs string keys and '/' joins, and pathlib objects are far heavier.
+# The root sentinel mirrors what Path('.') used to render as
+_ROOT_PATH = '.'
+
+
+def _as_posix(filepath):
+    '''Normalizes a str or Path filepath to a POSIX string'''
+    if isinstance(filepath, Path):
+        return filepath.as_posix()
+    return filepath or _ROOT_PATH
+
+
+def _stem(filepath):
+    '''Final path component without its extension, like Path.stem'''
+    name = filepath.rpartition('/')[2]
+    return name.rpartition('.')[0] or name
+
+
+def _preorder(root):
+    '''Pre-order traversal over an explicit stack.
+
+    Noticeably faster than anytree's PreOrderIter, which routes every
+    step through generator machinery and descriptor lookups
+    '''
+    stack = deque([root])
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        yield node
+        extend(reversed(node.children))
+
+
 class Color:
     HEADER = '\033[95m'
     OKBLUE = '\033[94m'
@@ -57,18 +85,12 @@ class Action(Enum):
 
     @property
     def color(self):
-        if self == Action.CREATE:
-            return Color.OKGREEN
-        elif self == Action.UPDATE:
-            return Color.OKCYAN
-        elif self == Action.DELETE:
-            return Color.FAIL
-        elif self == Action.NONE:
-            return Color.BOLD
-        return ''
+        # single dict hit instead of a chain of enum comparisons
+        return _ACTION_COLOR.get(self, '')
 
+    @lru_cache(maxsize=64)
     def render(self, string: str = '', ignore_none: bool = False) -> str:
-        if self == Action.NONE and ignore_none:
+        if self is Action.NONE and ignore_none:
             return ''
 
         color = self.color
@@ -78,6 +100,18 @@ class Action(Enum):
         return string
 
 
+_ACTION_COLOR = {
+    Action.CREATE: Color.OKGREEN,
+    Action.UPDATE: Color.OKCYAN,
+    Action.DELETE: Color.FAIL,
+    Action.NONE: Color.BOLD,
+}
+
+# membership sets for hot loops, so checks don't rebuild a list per node
+_CREATE_UPDATE = frozenset((Action.CREATE, Action.UPDATE))
+_ROOT_ENTITIES = frozenset((Entity.REPOSITORY, Entity.SUITE))
+
+
 class LocalCaseNode(NodeMixin):
     def __init__(
         self,
@@ -111,16 +145,17 @@ class LocalCaseNode(NodeMixin):
 
         super().__init__()
         self.entity = entity
-        self.filepath = Path(filepath)
+        self.filepath = _as_posix(filepath)
         self.action = action
 
-        if self.filepath == Path("."):
+        self.is_tree_root = self.filepath == _ROOT_PATH
+        if self.is_tree_root:
             self.entity = Entity.REPOSITORY
             self.name = "Repository"
-        elif entity == Entity.SUITE:
-            # stem will omit .feature extension
-            self.name = self.filepath.stem
-        elif entity == Entity.CASE:
+        elif entity is Entity.SUITE:
+            # stem omits the .feature extension
+            self.name = _stem(self.filepath)
+        elif entity is Entity.CASE:
             if not name:
                 raise ValueError('Cannot create Test Case node without name')
 
@@ -141,11 +176,14 @@ class LocalCaseNode(NodeMixin):
         self._set_key()
 
     def _set_key(self):
-        base = str(self.filepath).replace('.feature', '')
-        if self.entity == Entity.CASE:
+        base = self.filepath
+        if base.endswith('.feature'):
+            # cheaper than str.replace, which scans every path segment
+            base = base[:-len('.feature')]
+        if self.entity is Entity.CASE:
             self.key = f'{base}::{self.name}'
         else:
-            self.key = f'{base}'
+            self.key = base
 
 
 class RemoteCaseNode(NodeMixin):
@@ -192,13 +230,13 @@ class RemoteCaseNode(NodeMixin):
         self._custom_fields = x
 
         # setting initial values to make sure Qase won't complain that some field is absent
-        self.custom_field = deepcopy(config.QASE_CUSTOM_FIELD_DEFAULTS)
+        # defaults are primitive JSON values replaced wholesale per field,
+        # so a shallow copy is enough
+        custom_field = config.QASE_CUSTOM_FIELD_DEFAULTS.copy()
 
         # converting list of {'id': id, 'value': value} to single {id: value} dict
-        x = x if x else []
-        for dic in x:
-            id_, value = dic['id'], dic['value']
-            self.custom_field[id_] = value
+        custom_field.update({dic['id']: dic['value'] for dic in (x or [])})
+        self.custom_field = custom_field
 
     def _set_remote_filepath(self):
         """Creates fake filepath for remote objects.
@@ -206,18 +244,25 @@ class RemoteCaseNode(NodeMixin):
         This is later used to initialize unique keys and to compare trees
         """
 
-        if self.entity == Entity.REPOSITORY or self.parent is None:
-            self.filepath = Path(".")
-        elif self.parent and self.entity == Entity.SUITE:
-            self.filepath = self.parent.filepath / self.name
-        elif self.parent and self.entity == Entity.CASE:
+        self.is_tree_root = False
+        if self.entity is Entity.REPOSITORY or self.parent is None:
+            self.filepath = _ROOT_PATH
+            self.is_tree_root = True
+        elif self.parent and self.entity is Entity.SUITE:
+            if self.parent.is_tree_root:
+                # joining onto the '.' sentinel must not leave a './' prefix
+                self.filepath = self.name
+            else:
+                self.filepath = f'{self.parent.filepath}/{self.name}'
+        elif self.parent and self.entity is Entity.CASE:
             self.filepath = self.parent.filepath
 
     def _set_key(self):
-        if self.entity == Entity.CASE:
-            self.key = f'{str(self.filepath)}::{self.name}'
+        base = self.filepath
+        if self.entity is Entity.CASE:
+            self.key = f'{base}::{self.name}'
         else:
-            self.key = f'{str(self.filepath)}'
+            self.key = base
 
 
 class Tree:
@@ -233,6 +278,22 @@ class Tree:
         # maps unique node key to node reference (required for local/remote tree comparison)
         self.key_map = {root.key: root}
 
+        # action buckets filled in by diff_trees; when present, push only has
+        # to touch changed nodes instead of filtering the whole tree
+        self.pending_changes = None
+        self.pending_deletes = None
+
+        # one dict lookup replaces the if/elif chains over entity and action;
+        # each handler stays small enough to wrap or specialize independently
+        self._dispatch = {
+            (Entity.SUITE, Action.CREATE): self._suite_create,
+            (Entity.SUITE, Action.UPDATE): self._suite_update,
+            (Entity.SUITE, Action.DELETE): self._suite_delete,
+            (Entity.CASE, Action.CREATE): self._case_create,
+            (Entity.CASE, Action.UPDATE): self._case_update,
+            (Entity.CASE, Action.DELETE): self._case_delete,
+        }
+
     def get_node_by_suite_id(self, suite_id):
         return self.id_map.get(suite_id, None)
 
@@ -244,6 +305,14 @@ class Tree:
         if getattr(node, 'pk', None):
             self.id_map[node.pk] = node
 
+    def add_many(self, nodes):
+        '''Registers a batch of nodes with one dict update per index'''
+        nodes = list(nodes)
+        self.key_map.update({node.key: node for node in nodes})
+        self.id_map.update({node.pk: node for node in nodes
+                            if getattr(node, 'pk', None)})
+        return nodes
+
     def delete_node(self, node):
         self.key_map.pop(node.key)
         self.id_map.pop(node.pk)
@@ -251,12 +320,12 @@ class Tree:
 
     def add_local_suite(self, parent, filepath):
         node = LocalCaseNode(entity=Entity.SUITE, parent=parent, filepath=filepath)
-        self.key_map[node.key] = node
+        self.add_node(node)
         return node
 
     def add_local_case(self, parent, filepath, name):
         node = LocalCaseNode(entity=Entity.CASE, parent=parent, filepath=filepath, name=name)
-        self.key_map[node.key] = node
+        self.add_node(node)
         return node
 
     def add_remote_suite(self, suite):
@@ -267,8 +336,7 @@ class Tree:
             name=suite.title,
             parent=parent
         )
-        self.id_map[suite.id] = node
-        self.key_map[node.key] = node
+        self.add_node(node)
 
     def add_remote_case(self, case):
         parent = self.id_map.get(case.suite_id, None)
@@ -290,7 +358,7 @@ class Tree:
 
     def truncate_to(self, root_suite_id):
         for node in self.root.children:
-            if node.entity != Entity.SUITE:
+            if node.entity is not Entity.SUITE:
                 continue
 
             if node.pk != root_suite_id:
@@ -302,22 +370,57 @@ class Tree:
         '''Pushes everything regardless of Action. Not to be used in production!'''
         create_nodes(self.root, root_suite_id=root_suite_id)
 
-    def push(self, root_suite_id=config.QASE_ROOT_SUITE_ID, dry_run=False):
-        # For CREATE and UPDATE actions we traverse tree from top to bottom
-        for node in PreOrderIter(self.root):
-            if node.action == Action.NONE:
-                continue
-            elif node.action in [Action.CREATE, Action.UPDATE]:
-                self.perform_action(node, root_suite_id, dry_run=dry_run)
-
-        # for DELETE, we traverse tree from bottom (deepmost node) to top, thus
-        # guaranteeing that parent will not be deleted prior to a child
-        for level in reversed(group_nodes_by_level(self.root)):
-            for node in level:
-                if node.action in [Action.DELETE]:
-                    self.perform_action(node, root_suite_id, dry_run=dry_run)
+    def push(self, root_suite_id=config.QASE_ROOT_SUITE_ID, dry_run=False, parallel=8):
+        if dry_run:
+            # dry runs only print; one worker keeps the output in level order
+            parallel = 1
+        else:
+            # one attribute resolution for the whole push instead of a
+            # config.qase.<endpoint> chain inside every handler call
+            qase = config.qase
+            self._suites = qase.suites
+            self._cases = qase.cases
+            self._code = config.QASE_PROJECT_CODE
+
+        changes = self.pending_changes
+        deletes = self.pending_deletes
+        if changes is None:
+            # tree didn't come from diff_trees; fall back to a single scan.
+            # Ordering doesn't matter here: _group_by_depth below sorts each
+            # bucket by node depth, which is all the push order relies on
+            changes, deletes = [], []
+            for node in _preorder(self.root):
+                if node.action in _CREATE_UPDATE:
+                    changes.append(node)
+                elif node.action is Action.DELETE:
+                    deletes.append(node)
+
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            # For CREATE and UPDATE actions we go from top to bottom,
+            # so a parent always has its pk before its children are pushed;
+            # nodes of one depth are independent and pushed concurrently
+            for nodes in _group_by_depth(changes):
+                list(executor.map(
+                    lambda node: self.perform_action(node, root_suite_id, dry_run=dry_run),
+                    nodes,
+                ))
+
+            # for DELETE, we go from bottom (deepmost node) to top, thus
+            # guaranteeing that parent will not be deleted prior to a child
+            for nodes in _group_by_depth(deletes, reverse=True):
+                deleted = executor.map(
+                    lambda node: self.perform_action(node, root_suite_id, dry_run=dry_run),
+                    nodes,
+                )
+                # detaching mutates the shared parent's child list, which
+                # isn't thread-safe in anytree; do the bookkeeping here once
+                # the level's API calls have finished
+                for node in deleted:
+                    if node is not None:
+                        self.delete_node(node)
 
     def perform_action(self, node, root_suite_id, dry_run=False):
+        from qaseio.client.services import BadRequestException
         try:
             pk = f'[{node.pk}] ' if getattr(node, 'pk', '') else ''
             msg = f"{node.action.render()} {node.entity.value} node {pk}{node.key}"
@@ -327,64 +430,97 @@ class Tree:
             else:
                 logger.info(msg)
 
-            if node.entity in [Entity.REPOSITORY, Entity.SUITE] and node.filepath == Path("."):
+            if node.entity in _ROOT_ENTITIES and node.is_tree_root:
                 # We assume it's impossible for Entity.CASE to be the root node
                 node.pk = root_suite_id  # root node
-            elif node.entity == Entity.SUITE:
-                self.perform_action_on_suite(node, root_suite_id)
-            elif node.entity == Entity.CASE:
-                self.perform_action_on_case(node, root_suite_id)
+            else:
+                handler = self._dispatch.get((node.entity, node.action))
+                if handler:
+                    return handler(node)
         except BadRequestException as err:
             if 'There are no changes' in str(err):
                 pass
             else:
                 raise err
 
-    def perform_action_on_suite(self, node, root_suite_id):
-        if node.action == Action.CREATE:
-            suite = config.qase.suites.create(
-                config.QASE_PROJECT_CODE,
-                TestSuiteCreate(node.name, parent_id=node.parent.pk)
-            )
-            node.pk = suite.id
-            # self.add_remote_suite(suite)
-        elif node.action == Action.UPDATE:
-            suite = config.qase.suites.update(
-                config.QASE_PROJECT_CODE,
-                node.pk,
-                TestSuiteUpdate(title=node.name, parent_id=node.parent.pk)
-            )
-            node.pk = suite.id
-        elif node.action == Action.DELETE:
-            suite = config.qase.suites.delete(config.QASE_PROJECT_CODE, node.pk)
-            self.delete_node(node)
-
-    def perform_action_on_case(self, node, root_case_id):
-        if node.action == Action.CREATE:
-            case = config.qase.cases.create(
-                config.QASE_PROJECT_CODE,
-                TestCaseCreate(title=node.name, suite_id=node.parent.pk,
-                               custom_field=node.custom_field, **node.data)
-            )
-            node.pk = case.id
-        elif node.action == Action.UPDATE:
-            case = config.qase.cases.update(
-                config.QASE_PROJECT_CODE,
-                node.pk,
-                TestCaseUpdate(title=node.name, suite_id=node.parent.pk,
-                               custom_field=node.custom_field, **node.data)
-            )
-            node.pk = case.id
-        elif node.action == Action.DELETE:
-            case = config.qase.cases.delete(config.QASE_PROJECT_CODE, node.pk)
-            self.delete_node(node)
+    def _suite_create(self, node):
+        from qaseio.client.models import TestSuiteCreate
+
+        suite = self._suites.create(
+            self._code,
+            TestSuiteCreate(node.name, parent_id=node.parent.pk)
+        )
+        node.pk = suite.id
+
+    def _suite_update(self, node):
+        from qaseio.client.models import TestSuiteUpdate
+
+        suite = self._suites.update(
+            self._code,
+            node.pk,
+            TestSuiteUpdate(title=node.name, parent_id=node.parent.pk)
+        )
+        node.pk = suite.id
+
+    def _suite_delete(self, node):
+        self._suites.delete(self._code, node.pk)
+        # tree bookkeeping happens on the push thread; report success only
+        return node
+
+    def _case_create(self, node):
+        from qaseio.client.models import TestCaseCreate
+
+        case = self._cases.create(
+            self._code,
+            TestCaseCreate(title=node.name, suite_id=node.parent.pk,
+                           custom_field=node.custom_field, **node.data)
+        )
+        node.pk = case.id
+
+    def _case_update(self, node):
+        from qaseio.client.models import TestCaseUpdate
+
+        case = self._cases.update(
+            self._code,
+            node.pk,
+            TestCaseUpdate(title=node.name, suite_id=node.parent.pk,
+                           custom_field=node.custom_field, **node.data)
+        )
+        node.pk = case.id
+
+    def _case_delete(self, node):
+        self._cases.delete(self._code, node.pk)
+        return node
+
+
+def _group_by_depth(nodes, reverse=False):
+    '''Groups an ordered node list into per-depth sublists.
+
+    Proportional to the number of actionable nodes, unlike a BFS over
+    the whole tree
+    '''
+    by_depth = {}
+    for node in nodes:
+        by_depth.setdefault(node.depth, []).append(node)
+    for depth in sorted(by_depth, reverse=reverse):
+        yield by_depth[depth]
 
 
 def group_nodes_by_level(root):
-    return [children for children in LevelOrderGroupIter(root)]
+    # plain BFS, one list per level; cheaper than anytree's LevelOrderGroupIter
+    levels = []
+    level = [root]
+    while level:
+        levels.append(level)
+        level = [child for node in level for child in node.children]
+    return levels
 
 
 def render_case_tree(root_node, attrname='name', show_actions=False):
+    # deferred: rendering is the only consumer, and push/diff paths
+    # shouldn't pay the import
+    from anytree import RenderTree
+
     for pre, fill, node in RenderTree(root_node):
         status = f'{node.action.render()} ' if show_actions and getattr(node, 'action', None) else ''
         pk = getattr(node, "pk", '')
@@ -393,68 +529,109 @@ def render_case_tree(root_node, attrname='name', show_actions=False):
 
 
 def delete_tree_remotely(root):
+    # bound methods and the project code resolved once outside the loop
+    qase = config.qase
+    code = config.QASE_PROJECT_CODE
+    delete_case = qase.cases.delete
+    delete_suite = qase.suites.delete
+
     for level in reversed(group_nodes_by_level(root)):
         for node in level:
             if node.pk == root.pk:
                 # we don't want to delete root node
                 continue
 
-            if node.entity == Entity.CASE:
-                config.qase.cases.delete(config.QASE_PROJECT_CODE, node.pk)
-            elif node.entity == Entity.SUITE:
-                config.qase.suites.delete(config.QASE_PROJECT_CODE, node.pk)
+            if node.entity is Entity.CASE:
+                delete_case(code, node.pk)
+            elif node.entity is Entity.SUITE:
+                delete_suite(code, node.pk)
 
 
 def create_nodes(root_node, root_suite_id=config.QASE_ROOT_SUITE_ID):
-    for node in PreOrderIter(root_node):
-        create_node(node, root_suite_id=root_suite_id)
+    # resolved once for the whole walk instead of per node
+    qase = config.qase
+    code = config.QASE_PROJECT_CODE
+    for node in _preorder(root_node):
+        create_node(node, root_suite_id=root_suite_id, qase=qase, code=code)
+
 
+def create_node(node, root_suite_id=config.QASE_ROOT_SUITE_ID, qase=None, code=None):
+    from qaseio.client.models import TestCaseCreate, TestSuiteCreate
+
+    if qase is None:
+        qase = config.qase
+    if code is None:
+        code = config.QASE_PROJECT_CODE
 
-def create_node(node, root_suite_id=config.QASE_ROOT_SUITE_ID):
     logger.info(f"Dumping node [{node.entity}] {node.name}")
 
-    if node.entity == Entity.REPOSITORY or node.filepath == Path("."):
+    if node.entity is Entity.REPOSITORY or node.is_tree_root:
         # root node
         node.pk = root_suite_id
-    elif node.entity == Entity.SUITE:
-        suite = config.qase.suites.create(
-            config.QASE_PROJECT_CODE,
+    elif node.entity is Entity.SUITE:
+        suite = qase.suites.create(
+            code,
             TestSuiteCreate(node.name, parent_id=node.parent.pk)
         )
         node.pk = suite.id
-    elif node.entity == Entity.CASE:
-        case = config.qase.cases.create(
-            config.QASE_PROJECT_CODE,
+    elif node.entity is Entity.CASE:
+        case = qase.cases.create(
+            code,
             TestCaseCreate(node.name, suite_id=node.parent.pk, **node.data)
         )
         node.pk = case.id
 
 
-def flat_diff_trees(local, remote):
-    to_update = []
-    to_create = []
-    to_delete = []
+def _clone_node(node):
+    '''Clones a single node, sharing attribute values by reference.
 
-    for key, node_local in local.key_map.items():
-        if node_local.filepath == Path('.'):
-            continue
+    anytree's parent/children links are dropped so the clone can be
+    attached into the new tree without touching the original
+    '''
+    clone = object.__new__(type(node))
+    state = dict(node.__dict__)
+    state.pop('_NodeMixin__parent', None)
+    state.pop('_NodeMixin__children', None)
+    clone.__dict__.update(state)
+    return clone
 
-        try:
-            node_remote = remote.key_map[key]
-            to_update.append((Action.UPDATE, node_local, node_remote.pk))
-        except KeyError:
-            to_create.append((Action.CREATE, node_local, None))
 
-    for key, node_remote in remote.key_map.items():
-        if node_remote.filepath == Path('.'):
-            continue
+def _shallow_clone_tree(tree):
+    '''Clones a tree with one allocation per node.
 
-        try:
-            node_local = local.key_map[key]
-            continue
-        except KeyError:
-            # key exists remotely but doesn't exist locally, meaning we deleted this node
-            to_delete.append((Action.DELETE, node_remote, node_remote.pk))
+    deepcopy would recursively copy every node's data dict, custom fields
+    and anytree links; the diff/merge paths only reassign attributes, so
+    sharing the values by reference is enough and much cheaper
+    '''
+    mapping = {}
+    for node in _preorder(tree.root):
+        clone = _clone_node(node)
+        mapping[node] = clone
+        if node.parent is not None:
+            clone.parent = mapping[node.parent]
+
+    cloned = Tree(mapping[tree.root])
+    cloned.id_map = {pk: mapping[node] for pk, node in tree.id_map.items()}
+    cloned.key_map = {key: mapping[node] for key, node in tree.key_map.items()}
+    return cloned
+
+
+def flat_diff_trees(local, remote):
+    # set algebra on the key views classifies every node without
+    # per-key try/except control flow
+    local_keys = local.key_map.keys()
+    common = local_keys & remote.key_map.keys()
+
+    to_update = [(Action.UPDATE, node_local, remote.key_map[key].pk)
+                 for key, node_local in local.key_map.items()
+                 if key in common and not node_local.is_tree_root]
+    to_create = [(Action.CREATE, node_local, None)
+                 for key, node_local in local.key_map.items()
+                 if key not in common and not node_local.is_tree_root]
+    # keys that exist remotely but not locally are nodes we deleted
+    to_delete = [(Action.DELETE, node_remote, node_remote.pk)
+                 for key, node_remote in remote.key_map.items()
+                 if key not in local_keys and not node_remote.is_tree_root]
 
     operations = to_update + to_create + to_delete
     return operations
@@ -462,58 +639,72 @@ def flat_diff_trees(local, remote):
 
 def diff_trees(local, remote):
     '''Produces a merged tree that contains operation statuses'''
-    merged = deepcopy(local)
+    merged = _shallow_clone_tree(local)
+    merged_map = merged.key_map
+    remote_map = remote.key_map
+
+    # both trees share the root by construction; syncing it here keeps
+    # the is_tree_root special case out of the per-node loop
+    root = merged.root
+    root.action = Action.NONE
+    node_remote = remote_map.get(root.key)
+    if node_remote is not None:
+        root.pk = node_remote.pk
+        root.custom_fields = node_remote.custom_fields
+        root.custom_field = node_remote.custom_field.copy()
+
+    # set algebra on the key views classifies nodes without per-key
+    # try/except control flow
+    common = merged_map.keys() & remote_map.keys()
+
+    changes = []
+    for key, node_merged in merged_map.items():
+        if node_merged.is_tree_root:
+            continue
 
-    for key, node_merged in merged.key_map.items():
-        try:
-            node_remote = remote.key_map[key]
+        if key in common:
+            node_remote = remote_map[key]
             node_merged.pk = node_remote.pk
 
             # Qase doesn't let us update test cases without specifying
-            # value for each custom field, hence we retrieve them from remote tree
-            node_merged.custom_fields = deepcopy(node_remote.custom_fields)
-            node_merged.custom_field = deepcopy(node_remote.custom_field)
-
-            if node_merged.filepath == Path('.'):
-                node_merged.action = Action.NONE
-            else:
-                node_merged.action = Action.UPDATE
-        except KeyError:
-            node_merged.custom_field = deepcopy(config.QASE_CUSTOM_FIELD_DEFAULTS)
+            # value for each custom field, hence we retrieve them from remote tree;
+            # values are plain ids/strings, so sharing the list and shallow-copying
+            # the dict is enough
+            node_merged.custom_fields = node_remote.custom_fields
+            node_merged.custom_field = node_remote.custom_field.copy()
+            node_merged.action = Action.UPDATE
+        else:
+            node_merged.custom_field = config.QASE_CUSTOM_FIELD_DEFAULTS.copy()
             node_merged.action = Action.CREATE
-
-    for node_remote in PreOrderIter(remote.root):
-        node_merged = merged.get_node_by_key(node_remote.key)
-        if node_merged:  # node already exists, skipping
-            continue
-
-        # finding where to attach node we're copying from remote
-        node_merged = deepcopy(node_remote)
-        node_merged.children = []
-        node_merged_parent = merged.get_node_by_key(node_remote.parent.key)
-        node_merged.parent = node_merged_parent
+        changes.append(node_merged)
+
+    # remote-only keys are nodes to delete; a dict-view difference finds
+    # them without walking the remote tree. Sorting shallow-first (suites
+    # before their cases) guarantees each node's parent is already grafted
+    deletes = []
+    remote_only = remote_map.keys() - merged_map.keys()
+    for key in sorted(remote_only,
+                      key=lambda k: (remote_map[k].filepath.count('/'),
+                                     remote_map[k].entity is Entity.CASE, k)):
+        node_remote = remote_map[key]
+        # cloning keeps the remote filepath/key intact; re-deriving them
+        # from the merged parent would pick up the '.feature' suffix that
+        # local keys strip but local filepaths keep
+        node_merged = _clone_node(node_remote)
         node_merged.action = Action.DELETE
+        node_merged.parent = merged_map[node_remote.parent.key]
         merged.add_node(node_merged)
+        deletes.append(node_merged)
 
+    merged.pending_changes = changes
+    merged.pending_deletes = deletes
     return merged
 
 
 def merge_trees(local, remote):
-    diff_trees(local, remote)  # sets actions for each tree
-    merged = deepcopy(local)
-    for node_remote in PreOrderIter(remote.root):
-        node_merged = merged.get_node_by_key(node_remote.key)
-        if node_merged:
-            continue
-
-        node_merged = deepcopy(node_remote)
-
-        # finding where to attach node we're copying from remote
-        node_remote_parent_key = node_remote.parent.key
-        node_merged_parent = merged.get_node_by_key(node_remote_parent_key)
-        node_merged.parent = node_merged_parent
-
-    return merged
+    # diff_trees already grafts every remote-only node into the merged
+    # tree, so there's nothing left to add on top of it
+    return diff_trees(local, remote)
 
 
 def render_operations(operations, attr='key'):